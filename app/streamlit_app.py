@@ -24,26 +24,19 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def format_value(value, format_type="float", decimals=4):
-    """Format value, replacing NaN with 'Not available'."""
-    if pd.isna(value) or (isinstance(value, (float, np.floating)) and (np.isnan(value) or np.isinf(value))):
+    """Format value, replacing NaN/inf with 'Not available'."""
+    if pd.isna(value) or value in (np.inf, -np.inf):
         return "Not available"
-    if format_type == "float":
-        try:
+    try:
+        if format_type == "float":
             return f"{float(value):.{decimals}f}"
-        except (ValueError, TypeError):
-            return "Not available"
-    elif format_type == "percent":
-        try:
+        if format_type == "percent":
             return f"{float(value)*100:.2f}%"
-        except (ValueError, TypeError):
-            return "Not available"
-    elif format_type == "integer":
-        try:
+        if format_type == "integer":
             return f"{int(value):,}"
-        except (ValueError, TypeError):
-            return "Not available"
-    else:
-        return str(value) if value is not None else "Not available"
+    except (ValueError, TypeError):
+        return "Not available"
+    return str(value)
 
 # Page config
 st.set_page_config(
@@ -60,115 +53,106 @@ st.markdown("---")
 # Load data
 @st.cache_data
 def load_data():
-    """Load processed data."""
+    """Load processed data, preferring the parquet output over the CSV."""
+    parquet_path = DATA_PROCESSED_DIR / "ssi_processed.parquet"
     csv_path = DATA_PROCESSED_DIR / "ssi_processed.csv"
-    if not csv_path.exists():
-        st.error(f"Processed data not found at {csv_path}. Please run the pipeline first: `python -m src.pipeline`")
+    if parquet_path.exists():
+        # Parquet keeps the pipeline's dtypes, including categoricals
+        df = pd.read_parquet(parquet_path)
+    elif csv_path.exists():
+        df = pd.read_csv(
+            csv_path,
+            parse_dates=["surgery_date"],
+            dtype={
+                "procedure_category": "category",
+                "Specialty": "category",
+                "ssi": "int8",
+                "year": "int16",
+            },
+        )
+    else:
+        st.error(f"Processed data not found at {parquet_path}. Please run the pipeline first: `python -m src.pipeline`")
         st.stop()
-    return pd.read_csv(csv_path)
-
-try:
-    df = load_data()
     # Replace NaN values in string columns with "Not available" for display
-    string_cols = df.select_dtypes(include=['object']).columns
-    for col in string_cols:
-        df[col] = df[col].fillna("Not available")
-except Exception as e:
-    st.error(f"Error loading data: {e}")
-    st.stop()
-
-# Sidebar filters
-st.sidebar.header("Filters")
-
-# Category filter
-if "procedure_category" in df.columns:
-    categories = ["All"] + sorted(df["procedure_category"].unique().tolist())
-    selected_category = st.sidebar.selectbox("Procedure Category", categories)
-    if selected_category != "All":
-        df = df[df["procedure_category"] == selected_category]
-
-# Specialty filter (if available)
-if "Specialty" in df.columns:
-    specialties = ["All"] + sorted(df["Specialty"].dropna().unique().tolist())
-    selected_specialty = st.sidebar.selectbox("Specialty", specialties)
-    if selected_specialty != "All":
-        df = df[df["Specialty"] == selected_specialty]
-
-# Main dashboard
-# KPI Tiles
-st.header("Key Performance Indicators")
-col1, col2, col3, col4 = st.columns(4)
-
-overall_metrics = calculate_overall_metrics(df)
-temporal_monthly = calculate_temporal_metrics(df, period="month")
-
-with col1:
-    overall_rate = overall_metrics['overall_ssi_rate']
-    st.metric(
-        "Overall SSI Rate",
-        format_value(overall_rate, "float", 4),
-        format_value(overall_rate, "percent") if not pd.isna(overall_rate) else "Not available",
-    )
+    string_cols = df.select_dtypes(include="object").columns
+    df[string_cols] = df[string_cols].fillna("Not available")
+    # Categorical columns need the label as a category before it can be filled
+    for col in df.select_dtypes(include="category").columns:
+        if df[col].isna().any():
+            df[col] = df[col].cat.add_categories("Not available").fillna("Not available")
+    return df
+
+def filter_data(df, category, specialty):
+    """Apply sidebar filters with a single combined boolean mask.
+
+    Not cached: the unfiltered frame is returned as is, and one mask over two
+    categorical columns is cheaper than st.cache_data hashing its arguments
+    and unpickling a copy of the result on every rerun.
+    """
+    if category == "All" and specialty == "All":
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    if category != "All":
+        mask &= (df["procedure_category"] == category).to_numpy()
+    if specialty != "All":
+        mask &= (df["Specialty"] == specialty).to_numpy()
+    return df.loc[mask]
+
+# Cached metrics, keyed on the active filter values.
+# Streamlit skips hashing arguments prefixed with "_", so only filter_key is used
+# as the cache key and widgets like the top-N slider don't re-run aggregations.
+@st.cache_data
+def _overall(filter_key, _df):
+    """Overall metrics for the filtered data."""
+    return calculate_overall_metrics(_df)
 
-with col2:
-    if len(temporal_monthly) > 0:
-        last_month_rate = temporal_monthly.iloc[-1]["ssi_rate"]
-        st.metric(
-            "Last Month Rate",
-            format_value(last_month_rate, "float", 4),
-            format_value(last_month_rate, "percent") if not pd.isna(last_month_rate) else "Not available",
-        )
-    else:
-        st.metric("Last Month Rate", "Not available")
+@st.cache_data
+def _temporal(filter_key, _df, period="month"):
+    """Temporal metrics for the filtered data."""
+    return calculate_temporal_metrics(_df, period=period)
 
-with col3:
-    if len(temporal_monthly) > 0 and "rolling_3m_rate" in temporal_monthly.columns:
-        rolling_3m = temporal_monthly["rolling_3m_rate"].iloc[-1]
-        st.metric(
-            "Rolling 3-Month Rate",
-            format_value(rolling_3m, "float", 4),
-            format_value(rolling_3m, "percent") if not pd.isna(rolling_3m) else "Not available",
-        )
-    else:
-        st.metric("Rolling 3-Month Rate", "Not available")
+@st.cache_data
+def _category(filter_key, _df, min_volume=30):
+    """Category metrics for the filtered data."""
+    return calculate_category_metrics(_df, min_volume=min_volume)
 
-with col4:
-    st.metric(
-        "Total Surgeries",
-        format_value(overall_metrics['total_procedures'], "integer"),
-        f"{format_value(overall_metrics['total_infections'], 'integer')} infections",
-    )
+def _hash_frame(frame):
+    """Order-sensitive content hash for DataFrame arguments of cached builders."""
+    return tuple(frame.columns), pd.util.hash_pandas_object(frame).to_numpy().tobytes()
 
-st.markdown("---")
+_FRAME_HASH_FUNCS = {pd.DataFrame: _hash_frame}
 
-# Trend Chart
-st.header("📈 SSI Rate Trend (Monthly)")
-st.caption("**Description**: Shows the monthly SSI rate over time with a rolling 3-month average. The gray dashed line indicates the overall average rate. Use this to identify trends, spikes, or patterns in infection rates.")
-if len(temporal_monthly) > 0:
+# Figure builders are cached on their inputs, so reruns triggered by unrelated
+# widgets return the memoized Figure instead of rebuilding it.
+@st.cache_data(hash_funcs=_FRAME_HASH_FUNCS)
+def build_trend_fig(temporal_monthly):
+    """Build the monthly SSI trend chart."""
     fig_trend = go.Figure()
-    
+    # Months load as Period from parquet; plotly needs plain labels
+    months = temporal_monthly["month"].astype(str).to_numpy()
+
     fig_trend.add_trace(
-        go.Scatter(
-            x=temporal_monthly["month"],
-            y=temporal_monthly["ssi_rate"],
+        go.Scattergl(
+            x=months,
+            y=temporal_monthly["ssi_rate"].to_numpy(),
             mode="lines+markers",
             name="SSI Rate",
             line=dict(color="steelblue", width=2),
             marker=dict(size=8),
         )
     )
-    
+
     if "rolling_3m_rate" in temporal_monthly.columns:
         fig_trend.add_trace(
-            go.Scatter(
-                x=temporal_monthly["month"],
-                y=temporal_monthly["rolling_3m_rate"],
+            go.Scattergl(
+                x=months,
+                y=temporal_monthly["rolling_3m_rate"].to_numpy(),
                 mode="lines",
                 name="3-Month Rolling Avg",
                 line=dict(color="orange", width=2, dash="dash"),
             )
         )
-    
+
     overall_rate = temporal_monthly["ssi_rate"].mean()
     if not pd.isna(overall_rate):
         fig_trend.add_hline(
@@ -177,28 +161,21 @@ if len(temporal_monthly) > 0:
             line_color="gray",
             annotation_text=f"Overall Avg: {overall_rate:.4f}",
         )
-    
+
     fig_trend.update_layout(
         height=400,
         hovermode="x unified",
         xaxis_title="Month",
         yaxis_title="SSI Rate",
     )
-    
-    st.plotly_chart(fig_trend, use_container_width=True)
-else:
-    st.info("Insufficient data for trend chart")
 
-# Category Analysis
-st.header("📊 SSI Rate by Procedure Category")
-st.caption("**Description**: Displays the top procedure categories ranked by SSI rate. Error bars show 95% confidence intervals. The red dashed line indicates the overall average. Categories with rates significantly above the average may require targeted interventions.")
-category_metrics = calculate_category_metrics(df, min_volume=30)
+    return fig_trend
 
-if len(category_metrics) > 0:
-    # Bar chart
-    top_n = st.slider("Number of categories to display", 5, 20, 10)
+@st.cache_data(hash_funcs=_FRAME_HASH_FUNCS)
+def build_category_fig(category_metrics, top_n):
+    """Build the top-N category SSI rate bar chart."""
     top_categories = category_metrics.head(top_n).sort_values("ssi_rate", ascending=True)
-    
+
     fig_category = go.Figure()
     fig_category.add_trace(
         go.Bar(
@@ -213,7 +190,7 @@ if len(category_metrics) > 0:
             ),
         )
     )
-    
+
     overall_rate = category_metrics["ssi_rate"].mean()
     if not pd.isna(overall_rate):
         fig_category.add_vline(
@@ -222,53 +199,35 @@ if len(category_metrics) > 0:
             line_color="red",
             annotation_text=f"Overall: {overall_rate:.4f}",
         )
-    
+
     fig_category.update_layout(
         height=max(400, top_n * 30),
         xaxis_title="SSI Rate",
         yaxis_title="Procedure Category",
     )
-    
-    st.plotly_chart(fig_category, use_container_width=True)
-    
-    # Data table
-    with st.expander("View full category metrics table"):
-        # Replace NaN with "Not available" in the dataframe
-        display_df = category_metrics[["procedure_category", "total_procedures", "infections", "ssi_rate", "ci_lower", "ci_upper"]].copy()
-        display_df = display_df.fillna("Not available")
-        st.dataframe(
-            display_df.style.format({
-                "ssi_rate": lambda x: format_value(x, "float", 4) if isinstance(x, (int, float)) and not pd.isna(x) else "Not available",
-                "ci_lower": lambda x: format_value(x, "float", 4) if isinstance(x, (int, float)) and not pd.isna(x) else "Not available",
-                "ci_upper": lambda x: format_value(x, "float", 4) if isinstance(x, (int, float)) and not pd.isna(x) else "Not available",
-                "total_procedures": lambda x: format_value(x, "integer") if isinstance(x, (int, float)) and not pd.isna(x) else "Not available",
-                "infections": lambda x: format_value(x, "integer") if isinstance(x, (int, float)) and not pd.isna(x) else "Not available",
-            }, na_rep="Not available")
-        )
-else:
-    st.info("No categories meet minimum volume threshold (30 procedures)")
 
-# Volume vs Rate Scatter
-st.header("🎯 Procedure Volume vs SSI Rate")
-st.caption("**Description**: Bubble chart showing the relationship between procedure volume and SSI rate. Bubble size represents the number of infections. Categories in the upper-right quadrant (high volume + high rate) are priority targets for quality improvement initiatives.")
-if len(category_metrics) > 0:
+    return fig_category
+
+@st.cache_data
+def build_scatter_fig(labels, volumes, rates, infections, infections_max):
+    """Build the volume vs SSI rate bubble chart."""
     fig_scatter = go.Figure()
-    
+
     fig_scatter.add_trace(
-        go.Scatter(
-            x=category_metrics["total_procedures"],
-            y=category_metrics["ssi_rate"],
+        go.Scattergl(
+            x=volumes,
+            y=rates,
             mode="markers",
             marker=dict(
-                size=category_metrics["infections"],
+                size=infections,
                 sizemode="area",
-                sizeref=category_metrics["infections"].max() / 100,
-                color=category_metrics["ssi_rate"],
+                sizeref=infections_max / 100,
+                color=rates,
                 colorscale="Reds",
                 showscale=True,
                 colorbar=dict(title="SSI Rate"),
             ),
-            text=category_metrics["procedure_category"],
+            text=labels,
             hovertemplate=(
                 "<b>%{text}</b><br>"
                 "Volume: %{x}<br>"
@@ -277,14 +236,338 @@ if len(category_metrics) > 0:
             ),
         )
     )
-    
+
     fig_scatter.update_layout(
         height=500,
         xaxis_title="Total Procedures (Volume)",
         yaxis_title="SSI Rate",
     )
+
+    return fig_scatter
+
+@st.cache_data
+def build_dist_fig(rates):
+    """Build the SSI rate distribution histogram."""
+    fig_dist = go.Figure()
+    fig_dist.add_trace(
+        go.Histogram(
+            x=rates,
+            nbinsx=20,
+            marker_color="steelblue",
+            marker_line_color="white",
+            marker_line_width=1,
+        )
+    )
+
+    # Add mean line
+    mean_rate = rates.mean()
+    if not pd.isna(mean_rate):
+        fig_dist.add_vline(
+            x=mean_rate,
+            line_dash="dash",
+            line_color="red",
+            annotation_text=f"Mean: {mean_rate:.4f}",
+        )
+
+    fig_dist.update_layout(
+        height=350,
+        xaxis_title="SSI Rate",
+        yaxis_title="Number of Categories",
+        showlegend=False,
+    )
+
+    return fig_dist
+
+def _top_k(values, k):
+    """Indices of the k largest values, largest first, without a full sort."""
+    if len(values) > k:
+        idx = np.argpartition(-values, k - 1)[:k]
+    else:
+        idx = np.arange(len(values))
+    return idx[np.argsort(-values[idx], kind="stable")]
+
+@st.cache_data
+def build_comparison_fig(labels, rates):
+    """Build the top vs bottom performers bar chart."""
+    # Get top 5 (lowest rates, ascending) and bottom 5 (highest rates, descending)
+    top_5 = _top_k(-rates, 5)
+    bottom_5 = _top_k(rates, 5)
+
+    fig_comparison = go.Figure()
+
+    # Top performers (lowest rates)
+    fig_comparison.add_trace(
+        go.Bar(
+            x=labels[top_5],
+            y=rates[top_5],
+            name="Top 5 (Lowest Rates)",
+            marker_color="green",
+            text=rates[top_5].round(4),
+            textposition="outside",
+        )
+    )
+
+    # Bottom performers (highest rates)
+    fig_comparison.add_trace(
+        go.Bar(
+            x=labels[bottom_5],
+            y=rates[bottom_5],
+            name="Bottom 5 (Highest Rates)",
+            marker_color="red",
+            text=rates[bottom_5].round(4),
+            textposition="outside",
+        )
+    )
+
+    fig_comparison.update_layout(
+        height=400,
+        xaxis_title="Procedure Category",
+        yaxis_title="SSI Rate",
+        barmode="group",
+        xaxis_tickangle=-45,
+    )
+
+    return fig_comparison
+
+@st.cache_data
+def build_infections_fig(labels, infections):
+    """Build the infection count bar chart."""
+    # Sort by infection count
+    top_infections = _top_k(infections, 15)
+
+    fig_infections = go.Figure()
+    fig_infections.add_trace(
+        go.Bar(
+            x=labels[top_infections],
+            y=infections[top_infections],
+            marker_color="crimson",
+            text=infections[top_infections],
+            textposition="outside",
+        )
+    )
+
+    fig_infections.update_layout(
+        height=350,
+        xaxis_title="Procedure Category",
+        yaxis_title="Number of Infections",
+        xaxis_tickangle=-45,
+        showlegend=False,
+    )
+
+    return fig_infections
+
+@st.cache_data
+def build_risk_fig(labels, volumes, rates, infections, infections_max):
+    """Build the volume/rate risk matrix."""
+    # Calculate medians for quadrants
+    median_volume = np.median(volumes)
+    median_rate = np.median(rates)
+
+    # Handle NaN in medians
+    if pd.isna(median_volume):
+        median_volume = 0
+    if pd.isna(median_rate):
+        median_rate = 0
+
+    # Categorize
+    volume_high = volumes > median_volume
+    rate_high = rates > median_rate
+    quadrants = [volume_high & rate_high, volume_high & ~rate_high, ~volume_high & rate_high]
+    risk_types = ["High Risk", "High Volume, Low Rate", "Low Volume, High Rate", "Low Risk"]
+    risk_colors = ["red", "orange", "yellow", "green"]
+    risk_category = np.select(quadrants, risk_types[:3], default=risk_types[3])
+    colors = np.select(quadrants, risk_colors[:3], default=risk_colors[3])
+
+    fig_risk = go.Figure()
+
+    # All categories in one trace, coloured per point by risk quadrant
+    fig_risk.add_trace(
+        go.Scattergl(
+            x=volumes,
+            y=rates,
+            mode="markers+text",
+            showlegend=False,
+            marker=dict(
+                size=infections,
+                sizemode="area",
+                sizeref=infections_max / 50,
+                color=colors,
+                opacity=0.7,
+            ),
+            text=labels,
+            textposition="top center",
+            customdata=risk_category,
+            hovertemplate=(
+                "<b>%{text}</b><br>"
+                "Volume: %{x}<br>"
+                "SSI Rate: %{y:.4f}<br>"
+                "Risk: %{customdata}<extra></extra>"
+            ),
+        )
+    )
+
+    # Legend-only entries for the quadrants that are present
+    for risk_type, color in zip(risk_types, risk_colors):
+        if (risk_category == risk_type).any():
+            fig_risk.add_trace(
+                go.Scattergl(
+                    x=[None],
+                    y=[None],
+                    mode="markers",
+                    name=risk_type,
+                    marker=dict(size=10, color=color, opacity=0.7),
+                )
+            )
+
+    # Add quadrant lines
+    if not pd.isna(median_rate) and median_rate > 0:
+        fig_risk.add_hline(
+            y=median_rate,
+            line_dash="dash",
+            line_color="gray",
+            annotation_text=f"Median Rate: {median_rate:.4f}",
+        )
+    if not pd.isna(median_volume) and median_volume > 0:
+        fig_risk.add_vline(
+            x=median_volume,
+            line_dash="dash",
+            line_color="gray",
+            annotation_text=f"Median Volume: {median_volume:.0f}",
+        )
+
+    fig_risk.update_layout(
+        height=400,
+        xaxis_title="Total Procedures (Volume)",
+        yaxis_title="SSI Rate",
+        hovermode="closest",
+    )
+
+    return fig_risk
+
+try:
+    df = load_data()
+except Exception as e:
+    st.error(f"Error loading data: {e}")
+    st.stop()
+
+# Sidebar filters
+st.sidebar.header("Filters")
+
+# Category filter
+selected_category = "All"
+if "procedure_category" in df.columns:
+    # Categorical dtype: categories are already unique and sorted
+    categories = ["All"] + df["procedure_category"].cat.categories.tolist()
+    selected_category = st.sidebar.selectbox("Procedure Category", categories)
+
+# Specialty filter (if available)
+selected_specialty = "All"
+if "Specialty" in df.columns:
+    specialty_values = df["Specialty"]
+    if selected_category != "All":
+        specialty_values = df.loc[df["procedure_category"] == selected_category, "Specialty"]
+    specialties = ["All"] + sorted(specialty_values.dropna().unique().tolist())
+    selected_specialty = st.sidebar.selectbox("Specialty", specialties)
+
+filter_key = (selected_category, selected_specialty)
+df = filter_data(df, *filter_key)
+
+# Main dashboard
+# KPI Tiles
+st.header("Key Performance Indicators")
+col1, col2, col3, col4 = st.columns(4)
+
+overall_metrics = _overall(filter_key, df)
+temporal_monthly = _temporal(filter_key, df, period="month")
+
+with col1:
+    overall_rate = overall_metrics['overall_ssi_rate']
+    st.metric(
+        "Overall SSI Rate",
+        format_value(overall_rate, "float", 4),
+        format_value(overall_rate, "percent") if not pd.isna(overall_rate) else "Not available",
+    )
+
+with col2:
+    if len(temporal_monthly) > 0:
+        last_month_rate = temporal_monthly.iloc[-1]["ssi_rate"]
+        st.metric(
+            "Last Month Rate",
+            format_value(last_month_rate, "float", 4),
+            format_value(last_month_rate, "percent") if not pd.isna(last_month_rate) else "Not available",
+        )
+    else:
+        st.metric("Last Month Rate", "Not available")
+
+with col3:
+    if len(temporal_monthly) > 0 and "rolling_3m_rate" in temporal_monthly.columns:
+        rolling_3m = temporal_monthly["rolling_3m_rate"].iloc[-1]
+        st.metric(
+            "Rolling 3-Month Rate",
+            format_value(rolling_3m, "float", 4),
+            format_value(rolling_3m, "percent") if not pd.isna(rolling_3m) else "Not available",
+        )
+    else:
+        st.metric("Rolling 3-Month Rate", "Not available")
+
+with col4:
+    st.metric(
+        "Total Surgeries",
+        format_value(overall_metrics['total_procedures'], "integer"),
+        f"{format_value(overall_metrics['total_infections'], 'integer')} infections",
+    )
+
+st.markdown("---")
+
+# Trend Chart
+st.header("📈 SSI Rate Trend (Monthly)")
+st.caption("**Description**: Shows the monthly SSI rate over time with a rolling 3-month average. The gray dashed line indicates the overall average rate. Use this to identify trends, spikes, or patterns in infection rates.")
+if len(temporal_monthly) > 0:
+    st.plotly_chart(build_trend_fig(temporal_monthly), use_container_width=True)
+else:
+    st.info("Insufficient data for trend chart")
+
+# Category Analysis
+st.header("📊 SSI Rate by Procedure Category")
+st.caption("**Description**: Displays the top procedure categories ranked by SSI rate. Error bars show 95% confidence intervals. The red dashed line indicates the overall average. Categories with rates significantly above the average may require targeted interventions.")
+category_metrics = _category(filter_key, df, min_volume=30)
+
+# Column arrays shared by the charts and summary below. Labels use a fixed-width
+# string dtype so Streamlit hashes their contents rather than object pointers.
+labels = category_metrics["procedure_category"].to_numpy(dtype=str)
+rates = category_metrics["ssi_rate"].to_numpy()
+infections = category_metrics["infections"].to_numpy()
+volumes = category_metrics["total_procedures"].to_numpy()
+infections_max = infections.max(initial=0)
+
+if len(category_metrics) > 0:
+    # Bar chart
+    top_n = st.slider("Number of categories to display", 5, 20, 10)
+    st.plotly_chart(build_category_fig(category_metrics, top_n), use_container_width=True)
     
-    st.plotly_chart(fig_scatter, use_container_width=True)
+    # Data table
+    with st.expander("View full category metrics table"):
+        # Pre-format columns as strings, replacing NaN with "Not available"
+        display_df = category_metrics[["procedure_category", "total_procedures", "infections", "ssi_rate", "ci_lower", "ci_upper"]].copy()
+        display_df["procedure_category"] = display_df["procedure_category"].astype(str)
+        for col, fmt in [
+            ("ssi_rate", "{:.4f}"),
+            ("ci_lower", "{:.4f}"),
+            ("ci_upper", "{:.4f}"),
+            ("total_procedures", "{:,.0f}"),
+            ("infections", "{:,.0f}"),
+        ]:
+            values = display_df[col]
+            display_df[col] = np.where(values.isna(), "Not available", values.map(fmt.format))
+        st.dataframe(display_df)
+else:
+    st.info("No categories meet minimum volume threshold (30 procedures)")
+
+# Volume vs Rate Scatter
+st.header("🎯 Procedure Volume vs SSI Rate")
+st.caption("**Description**: Bubble chart showing the relationship between procedure volume and SSI rate. Bubble size represents the number of infections. Categories in the upper-right quadrant (high volume + high rate) are priority targets for quality improvement initiatives.")
+if len(category_metrics) > 0:
+    st.plotly_chart(build_scatter_fig(labels, volumes, rates, infections, infections_max), use_container_width=True)
 else:
     st.info("Insufficient data for scatter plot")
 
@@ -302,35 +585,7 @@ with col_left:
     st.caption("**Description**: Histogram showing the distribution of SSI rates across all procedure categories. Helps identify if most categories cluster around a specific rate or if there are outliers.")
     
     if len(category_metrics) > 0:
-        fig_dist = go.Figure()
-        fig_dist.add_trace(
-            go.Histogram(
-                x=category_metrics["ssi_rate"],
-                nbinsx=20,
-                marker_color="steelblue",
-                marker_line_color="white",
-                marker_line_width=1,
-            )
-        )
-        
-        # Add mean line
-        mean_rate = category_metrics["ssi_rate"].mean()
-        if not pd.isna(mean_rate):
-            fig_dist.add_vline(
-                x=mean_rate,
-                line_dash="dash",
-                line_color="red",
-                annotation_text=f"Mean: {mean_rate:.4f}",
-            )
-        
-        fig_dist.update_layout(
-            height=350,
-            xaxis_title="SSI Rate",
-            yaxis_title="Number of Categories",
-            showlegend=False,
-        )
-        
-        st.plotly_chart(fig_dist, use_container_width=True)
+        st.plotly_chart(build_dist_fig(rates), use_container_width=True)
     else:
         st.info("Insufficient data for distribution chart")
 
@@ -339,45 +594,7 @@ with col_left:
     st.caption("**Description**: Comparison of the best and worst performing categories. Top performers have the lowest SSI rates, while bottom performers have the highest. This helps identify best practices and areas needing improvement.")
     
     if len(category_metrics) >= 6:
-        # Get top 5 and bottom 5
-        top_5 = category_metrics.tail(5).sort_values("ssi_rate", ascending=True)
-        bottom_5 = category_metrics.head(5).sort_values("ssi_rate", ascending=False)
-        
-        fig_comparison = go.Figure()
-        
-        # Top performers (lowest rates)
-        fig_comparison.add_trace(
-            go.Bar(
-                x=top_5["procedure_category"],
-                y=top_5["ssi_rate"],
-                name="Top 5 (Lowest Rates)",
-                marker_color="green",
-                text=top_5["ssi_rate"].round(4),
-                textposition="outside",
-            )
-        )
-        
-        # Bottom performers (highest rates)
-        fig_comparison.add_trace(
-            go.Bar(
-                x=bottom_5["procedure_category"],
-                y=bottom_5["ssi_rate"],
-                name="Bottom 5 (Highest Rates)",
-                marker_color="red",
-                text=bottom_5["ssi_rate"].round(4),
-                textposition="outside",
-            )
-        )
-        
-        fig_comparison.update_layout(
-            height=400,
-            xaxis_title="Procedure Category",
-            yaxis_title="SSI Rate",
-            barmode="group",
-            xaxis_tickangle=-45,
-        )
-        
-        st.plotly_chart(fig_comparison, use_container_width=True)
+        st.plotly_chart(build_comparison_fig(labels, rates), use_container_width=True)
     else:
         st.info("Need at least 6 categories for comparison")
 
@@ -387,29 +604,7 @@ with col_right:
     st.caption("**Description**: Shows how many infections each category has. Categories with high infection counts, even if rates are moderate, contribute significantly to the total infection burden and should be prioritized.")
     
     if len(category_metrics) > 0:
-        # Sort by infection count
-        top_infections = category_metrics.nlargest(15, "infections")
-        
-        fig_infections = go.Figure()
-        fig_infections.add_trace(
-            go.Bar(
-                x=top_infections["procedure_category"],
-                y=top_infections["infections"],
-                marker_color="crimson",
-                text=top_infections["infections"],
-                textposition="outside",
-            )
-        )
-        
-        fig_infections.update_layout(
-            height=350,
-            xaxis_title="Procedure Category",
-            yaxis_title="Number of Infections",
-            xaxis_tickangle=-45,
-            showlegend=False,
-        )
-        
-        st.plotly_chart(fig_infections, use_container_width=True)
+        st.plotly_chart(build_infections_fig(labels, infections), use_container_width=True)
     else:
         st.info("Insufficient data for infection count chart")
 
@@ -418,86 +613,7 @@ with col_right:
     st.caption("**Description**: Categorizes procedures into risk quadrants based on volume and SSI rate. High-risk categories (high volume + high rate) require immediate attention, while low-risk categories (low volume + low rate) represent best practices.")
     
     if len(category_metrics) > 0:
-        # Calculate medians for quadrants
-        median_volume = category_metrics["total_procedures"].median()
-        median_rate = category_metrics["ssi_rate"].median()
-        
-        # Handle NaN in medians
-        if pd.isna(median_volume):
-            median_volume = 0
-        if pd.isna(median_rate):
-            median_rate = 0
-        
-        # Categorize
-        category_metrics["risk_category"] = category_metrics.apply(
-            lambda row: "High Risk" if (row["total_procedures"] > median_volume and row["ssi_rate"] > median_rate)
-            else "High Volume, Low Rate" if (row["total_procedures"] > median_volume and row["ssi_rate"] <= median_rate)
-            else "Low Volume, High Rate" if (row["total_procedures"] <= median_volume and row["ssi_rate"] > median_rate)
-            else "Low Risk",
-            axis=1
-        )
-        
-        # Color mapping
-        color_map = {
-            "High Risk": "red",
-            "High Volume, Low Rate": "orange",
-            "Low Volume, High Rate": "yellow",
-            "Low Risk": "green"
-        }
-        
-        fig_risk = go.Figure()
-        
-        for risk_type in ["High Risk", "High Volume, Low Rate", "Low Volume, High Rate", "Low Risk"]:
-            risk_data = category_metrics[category_metrics["risk_category"] == risk_type]
-            if len(risk_data) > 0:
-                fig_risk.add_trace(
-                    go.Scatter(
-                        x=risk_data["total_procedures"],
-                        y=risk_data["ssi_rate"],
-                        mode="markers+text",
-                        name=risk_type,
-                        marker=dict(
-                            size=risk_data["infections"],
-                            sizemode="area",
-                            sizeref=category_metrics["infections"].max() / 50,
-                            color=color_map[risk_type],
-                            opacity=0.7,
-                        ),
-                        text=risk_data["procedure_category"],
-                        textposition="top center",
-                        hovertemplate=(
-                            "<b>%{text}</b><br>"
-                            "Volume: %{x}<br>"
-                            "SSI Rate: %{y:.4f}<br>"
-                            "Risk: " + risk_type + "<extra></extra>"
-                        ),
-                    )
-                )
-        
-        # Add quadrant lines
-        if not pd.isna(median_rate) and median_rate > 0:
-            fig_risk.add_hline(
-                y=median_rate,
-                line_dash="dash",
-                line_color="gray",
-                annotation_text=f"Median Rate: {median_rate:.4f}",
-            )
-        if not pd.isna(median_volume) and median_volume > 0:
-            fig_risk.add_vline(
-                x=median_volume,
-                line_dash="dash",
-                line_color="gray",
-                annotation_text=f"Median Volume: {median_volume:.0f}",
-            )
-        
-        fig_risk.update_layout(
-            height=400,
-            xaxis_title="Total Procedures (Volume)",
-            yaxis_title="SSI Rate",
-            hovermode="closest",
-        )
-        
-        st.plotly_chart(fig_risk, use_container_width=True)
+        st.plotly_chart(build_risk_fig(labels, volumes, rates, infections, infections_max), use_container_width=True)
     else:
         st.info("Insufficient data for risk matrix")
 
@@ -508,6 +624,7 @@ st.header("📋 Summary Statistics")
 st.caption("**Description**: Key statistical measures for SSI rates across all procedure categories. Provides a quick overview of central tendencies, spread, and distribution characteristics.")
 
 if len(category_metrics) > 0:
+    rate_stats = category_metrics["ssi_rate"].describe(percentiles=[0.25, 0.5, 0.75])
     summary_stats = {
         "Metric": [
             "Mean SSI Rate",
@@ -522,16 +639,16 @@ if len(category_metrics) > 0:
             "Total Infections",
         ],
         "Value": [
-            format_value(category_metrics['ssi_rate'].mean(), "float", 4),
-            format_value(category_metrics['ssi_rate'].median(), "float", 4),
-            format_value(category_metrics['ssi_rate'].std(), "float", 4),
-            format_value(category_metrics['ssi_rate'].min(), "float", 4),
-            format_value(category_metrics['ssi_rate'].max(), "float", 4),
-            format_value(category_metrics['ssi_rate'].quantile(0.25), "float", 4),
-            format_value(category_metrics['ssi_rate'].quantile(0.75), "float", 4),
+            format_value(rate_stats["mean"], "float", 4),
+            format_value(rate_stats["50%"], "float", 4),
+            format_value(rate_stats["std"], "float", 4),
+            format_value(rate_stats["min"], "float", 4),
+            format_value(rate_stats["max"], "float", 4),
+            format_value(rate_stats["25%"], "float", 4),
+            format_value(rate_stats["75%"], "float", 4),
             format_value(len(category_metrics), "integer"),
-            format_value(category_metrics['total_procedures'].sum(), "integer"),
-            format_value(category_metrics['infections'].sum(), "integer"),
+            format_value(volumes.sum(), "integer"),
+            format_value(infections.sum(), "integer"),
         ],
     }
     
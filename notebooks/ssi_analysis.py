@@ -12,7 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
-from src.config import DATA_PROCESSED_DIR
+from src.config import DATA_PROCESSED_DIR, PROCEDURE_COUNT_COLUMN
 from src.metrics import (
     calculate_category_metrics,
     calculate_overall_metrics,
@@ -21,6 +21,7 @@ from src.metrics import (
     calculate_temporal_metrics,
     calculate_trend,
     detect_outliers,
+    pre_post_counts,
 )
 from src.stats_tests import test_pre_post_comparison
 from src.viz import (
@@ -35,16 +36,24 @@ print("=" * 60)
 print("SSI Analysis - Answering Q1-Q5")
 print("=" * 60)
 
-# Load processed data
+# Load processed data (parquet keeps dtypes, so prefer it over the CSV)
+parquet_path = DATA_PROCESSED_DIR / "ssi_processed.parquet"
 csv_path = DATA_PROCESSED_DIR / "ssi_processed.csv"
-if not csv_path.exists():
-    print(f"ERROR: Processed data not found at {csv_path}")
+if parquet_path.exists():
+    df = pd.read_parquet(parquet_path)
+elif csv_path.exists():
+    # The 0/1 flag fits in int8, an eighth of the bytes the sums read as int64
+    df = pd.read_csv(csv_path, parse_dates=["surgery_date"], dtype={"ssi": "int8"})
+else:
+    print(f"ERROR: Processed data not found at {parquet_path} or {csv_path}")
     print("Please run the pipeline first: python -m src.pipeline")
     sys.exit(1)
 
-df = pd.read_csv(csv_path)
-df["surgery_date"] = pd.to_datetime(df["surgery_date"])
-print(f"\nLoaded {len(df):,} records")
+if PROCEDURE_COUNT_COLUMN in df.columns:
+    # Aggregated input is kept as count rows rather than one row per procedure
+    print(f"\nLoaded {len(df):,} aggregated rows covering {df[PROCEDURE_COUNT_COLUMN].sum():,} procedures")
+else:
+    print(f"\nLoaded {len(df):,} records")
 
 # Q1: Overall SSI rate & change over time
 print("\n" + "=" * 60)
@@ -60,12 +69,16 @@ print(f"95% CI: [{overall_metrics['rate_lower_ci']:.4f}, {overall_metrics['rate_
 # Monthly analysis
 temporal_monthly = calculate_temporal_metrics(df, period="month")
 print(f"\nMonthly SSI Rates:")
-print(temporal_monthly[["month", "total_procedures", "infections", "ssi_rate"]].to_string(index=False))
+temporal_monthly[["month", "total_procedures", "infections", "ssi_rate"]].to_csv(
+    sys.stdout, sep="\t", index=False, float_format="%.4f"
+)
 
 # Quarterly analysis
 temporal_quarterly = calculate_temporal_metrics(df, period="quarter")
 print(f"\nQuarterly SSI Rates:")
-print(temporal_quarterly[["quarter", "total_procedures", "infections", "ssi_rate"]].to_string(index=False))
+temporal_quarterly[["quarter", "total_procedures", "infections", "ssi_rate"]].to_csv(
+    sys.stdout, sep="\t", index=False, float_format="%.4f"
+)
 
 # Trend analysis
 trend_results = calculate_trend(temporal_monthly)
@@ -77,7 +90,7 @@ print(f"  P-value: {trend_results['p_value']:.4f}")
 print(f"  Significant: {trend_results['significant']}")
 
 # Outlier detection
-outliers = detect_outliers(temporal_monthly)
+outliers, outlier_threshold = detect_outliers(temporal_monthly)
 if outliers:
     print(f"\nOutlier Periods Detected: {outliers}")
 else:
@@ -95,13 +108,17 @@ print("=" * 60)
 category_metrics = calculate_category_metrics(df, min_volume=30)
 print(f"\nTop 10 Categories by SSI Rate (min volume ≥30):")
 top_10 = category_metrics.head(10)
-for idx, row in top_10.iterrows():
-    print(f"  {row['procedure_category']}: {row['ssi_rate']:.4f} ({row['infections']}/{row['total_procedures']})")
+for category, ssi_rate, infections, total in top_10[
+    ["procedure_category", "ssi_rate", "infections", "total_procedures"]
+].itertuples(index=False, name=None):
+    print(f"  {category}: {ssi_rate:.4f} ({infections}/{total})")
 
 print(f"\nTop 10 Categories by Infection Count:")
-top_10_by_count = category_metrics.sort_values("infections", ascending=False).head(10)
-for idx, row in top_10_by_count.iterrows():
-    print(f"  {row['procedure_category']}: {row['infections']} infections (rate: {row['ssi_rate']:.4f})")
+top_10_by_count = category_metrics.nlargest(10, "infections")
+for category, infections, ssi_rate in top_10_by_count[
+    ["procedure_category", "infections", "ssi_rate"]
+].itertuples(index=False, name=None):
+    print(f"  {category}: {infections} infections (rate: {ssi_rate:.4f})")
 
 plot_category_rates(category_metrics, top_n=10, filename="q2_category_rates")
 
@@ -123,7 +140,8 @@ print("\n" + "=" * 60)
 print("Q4: Pre vs Post Initiative Comparison")
 print("=" * 60)
 
-pre_post_comparison = calculate_pre_post_comparison(df)
+pre_post = pre_post_counts(df)
+pre_post_comparison = calculate_pre_post_comparison(df, counts=pre_post)
 print(f"\nPre-Initiative:")
 print(f"  SSI Rate: {pre_post_comparison['pre']['overall_ssi_rate']:.4f}")
 print(f"  Procedures: {pre_post_comparison['pre']['total_procedures']:,}")
@@ -140,7 +158,7 @@ print(f"  Relative: {pre_post_comparison['relative_change']:+.1f}%")
 print(f"  Improvement: {pre_post_comparison['improvement']}")
 
 # Statistical tests
-pre_post_test = test_pre_post_comparison(df)
+pre_post_test = test_pre_post_comparison(df, counts=pre_post)
 print(f"\nStatistical Tests:")
 print(f"  Two-Proportion Z-Test:")
 print(f"    Z-statistic: {pre_post_test['z_test']['statistic']:.4f}")
@@ -171,9 +189,7 @@ print(f"  3. Rolling 3-Month SSI Rate: Use for trend detection")
 print(f"  4. Total Surgeries: Track volume trends")
 
 print("\nAlert Thresholds:")
-mean_rate = temporal_monthly["ssi_rate"].mean()
-std_rate = temporal_monthly["ssi_rate"].std()
-print(f"  Outlier Detection: Monthly rate > {mean_rate + 2*std_rate:.4f} (mean + 2×SD)")
+print(f"  Outlier Detection: Monthly rate > {outlier_threshold:.4f} (mean + 2×SD)")
 print(f"  Category Alert: Category rate > overall rate + 2×SD")
 
 print("\nMonitoring Frequency:")